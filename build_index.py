@@ -0,0 +1,192 @@
+import concurrent.futures
+import contextlib
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+import dotenv
+import google.generativeai as genai
+import numpy as np
+
+EMBEDDING_MODEL_NAME = "models/text-embedding-004"
+TOKENIZER_MODEL_NAME = "models/gemini-1.5-flash-002"
+
+# Dates are kept whole so "2024-05-30" matches a single token
+_TOKEN_RE = re.compile(r"\d{4}-\d{2}-\d{2}|[a-z0-9]+")
+# Kept as one block of words, easier to read and edit than a list literal
+_STOPWORDS = frozenset(
+    """
+    a about above after again all also am an and any are as at be been before being
+    between both but by can could did do does doing during each few for from further
+    had has have having he her here hers him his how i if in into is it its just me
+    more most my no nor not now of off on once only or other our out over own s same
+    say said she should so some such t tell than that the their them then there these
+    they this those through to too under until up very was we were what when where
+    which while who whom why will with would you your
+    """.split(),  # noqa: SIM905
+)
+
+
+def index_paths(summaries_path: Path) -> tuple[Path, Path, Path]:
+    """Returns the paths of the embeddings, scale and ids files built from a summaries file."""
+    return (
+        summaries_path.with_name(f"{summaries_path.stem}_int8.npy"),
+        summaries_path.with_name(f"{summaries_path.stem}_scale.npy"),
+        summaries_path.with_name(f"{summaries_path.stem}_ids.json"),
+    )
+
+
+def document_store_path(documents_path: Path) -> Path:
+    """Returns the path of the SQLite document store built from a documents file."""
+    return documents_path.with_suffix(".sqlite")
+
+
+def token_counts_path(documents_path: Path) -> Path:
+    """Returns the path of the token counts file built from a documents file."""
+    return documents_path.with_name(f"{documents_path.stem}_tokens.json")
+
+
+def is_out_of_date(source_path: Path, *built_paths: Path) -> bool:
+    """Whether any file built from `source_path` is missing or older than it."""
+    if not all(path.exists() for path in built_paths):
+        return True
+    if not source_path.exists():
+        return False
+    source_mtime = source_path.stat().st_mtime
+    return any(path.stat().st_mtime < source_mtime for path in built_paths)
+
+
+def document_to_string(doc_id: str, doc: dict) -> str:
+    """Formats a single document (or summary) as a delimited block of text."""
+    parts = [
+        f"*********************DOCUMENT {doc_id} START*********************\n",
+        f"ID: {doc_id}\n",
+    ]
+    parts.extend(f"{k.upper()}: {v}\n" for k, v in doc.items())
+    parts.append(
+        f"*********************DOCUMENT {doc_id} END*********************\n\n\n\n",
+    )
+    return "".join(parts)
+
+
+def summary_to_string(doc_id: str, summary: dict) -> str:
+    """Formats one summary as the text that gets embedded."""
+    lines = [f"ID: {doc_id}"]
+    lines.extend(f"{k.upper()}: {v}" for k, v in summary.items())
+    return "\n".join(lines)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens without stopwords, for keyword (BM25) search."""
+    return [w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def embed(content: str | list[str], task_type: str) -> np.ndarray:
+    """Embed one string (1-D result) or a list of strings (2-D result).
+
+    Rows are L2-normalized, so a dot product is the cosine similarity.
+    """
+    result = genai.embed_content(
+        model=EMBEDDING_MODEL_NAME,
+        content=content,
+        task_type=task_type,
+    )
+    embeddings = np.asarray(result["embedding"], dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings
+
+
+def quantize(embeddings: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Quantize embeddings to int8 with one scale per dimension.
+
+    Returns the int8 embeddings and the scales, so that `quantized / scale` approximates
+    the original embeddings.
+    """
+    scale = 127.0 / np.maximum(np.abs(embeddings).max(axis=0), 1e-12)
+    quantized = np.round(embeddings * scale).astype(np.int8)
+    return quantized, scale.astype(np.float32)
+
+
+def build_index(summaries_path: Path) -> None:
+    """Embeds every summary and writes the embeddings and their document ids.
+
+    Creates three files next to the summaries file:
+        - `<name>_int8.npy`: int8 array with one quantized, L2-normalized embedding per row
+        - `<name>_scale.npy`: float32 per-dimension scales of the quantized embeddings
+        - `<name>_ids.json`: list with the document id of each row
+    """
+    with summaries_path.open(encoding="utf-8") as f:
+        summaries = json.load(f)
+
+    ids = list(summaries)
+    embeddings = embed(
+        [summary_to_string(k, v) for k, v in summaries.items()],
+        task_type="retrieval_document",
+    )
+
+    quantized, scale = quantize(embeddings)
+    embeddings_path, scale_path, ids_path = index_paths(summaries_path)
+    np.save(embeddings_path, quantized)
+    np.save(scale_path, scale)
+    with ids_path.open("w", encoding="utf-8") as f:
+        json.dump(ids, f)
+
+
+def build_document_store(documents_path: Path) -> None:
+    """Writes every document, formatted with `document_to_string`, to an SQLite store.
+
+    The store is created next to the documents file, with a single table
+    `documents(id, type, id_number, blob)` keyed by document id. The bot reads documents from it
+    one at a time instead of holding the whole corpus in memory.
+    """
+    with documents_path.open(encoding="utf-8") as f:
+        documents = json.load(f)
+
+    # Build under a temporary name so a half-written store is never picked up
+    store_path = document_store_path(documents_path)
+    tmp_path = store_path.with_suffix(".sqlite.tmp")
+    tmp_path.unlink(missing_ok=True)
+    with contextlib.closing(sqlite3.connect(tmp_path)) as conn, conn:
+        conn.execute(
+            "CREATE TABLE documents "
+            "(id TEXT PRIMARY KEY, type TEXT, id_number TEXT, blob TEXT)",
+        )
+        conn.executemany(
+            "INSERT INTO documents VALUES (?, ?, ?, ?)",
+            (
+                (k, v["type"], v["id_number"], document_to_string(k, v))
+                for k, v in documents.items()
+            ),
+        )
+    tmp_path.replace(store_path)
+
+
+def build_token_counts(documents_path: Path) -> None:
+    """Counts the Gemini tokens of every formatted document.
+
+    Writes `<name>_tokens.json` next to the documents file, mapping document ids to token counts.
+    """
+    with documents_path.open(encoding="utf-8") as f:
+        documents = json.load(f)
+
+    model = genai.GenerativeModel(TOKENIZER_MODEL_NAME)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as ex:
+        counts = ex.map(
+            lambda item: model.count_tokens(document_to_string(*item)).total_tokens,
+            documents.items(),
+        )
+        token_counts = dict(zip(documents, counts, strict=True))
+
+    with token_counts_path(documents_path).open("w", encoding="utf-8") as f:
+        json.dump(token_counts, f)
+
+
+if __name__ == "__main__":
+    dotenv.load_dotenv()
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+    build_document_store(Path("documents.json"))
+    build_index(Path("summaries.json"))
+    build_token_counts(Path("documents.json"))
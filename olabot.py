@@ -1,22 +1,259 @@
+import asyncio
+import concurrent.futures
 import datetime
-import inspect
 import json
 import os
+import re
+import sqlite3
 import sys
 import traceback
-from collections.abc import Generator
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator, Callable, Generator
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 import dotenv
 import google.generativeai as genai
+import numpy as np
 from colorama import Back, Fore, Style
+from rank_bm25 import BM25Okapi
+
+import build_index
+from build_index import document_to_string
 
 dotenv.load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 genai.configure(api_key=GEMINI_API_KEY)
 
 TZ = ZoneInfo("America/Toronto")
+# Where a JSON object or array may start in an LLM response
+JSON_START_PATTERN = re.compile(r"[{\[]")
+
+
+class _SqliteDict:
+    """Read-only mapping from document id to formatted document, backed by the document store."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getitem__(self, doc_id: str) -> str:
+        row = self._conn.execute(
+            "SELECT blob FROM documents WHERE id = ?",
+            (doc_id,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(doc_id)
+        return row[0]
+
+    def __contains__(self, doc_id: str) -> bool:
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM documents WHERE id = ?",
+                (doc_id,),
+            ).fetchone()
+            is not None
+        )
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+class _NoColor:
+    """Stands in for colorama's Fore, Back and Style when stdout is not a terminal."""
+
+    def __getattr__(self, name: str) -> str:
+        return ""
+
+
+# Don't write escape codes into pipes and files
+if not sys.stdout.isatty():
+    Back = Fore = Style = _NoColor()
+
+_SYSTEM_PROMPT = """
+        You are a helpful assistant making the Ontario Legislative Assembly more accessible to average citizens.
+
+        IMPORTANT: You have persistent access to cached Ontario Legislative Assembly documents, including transcripts and bills.
+        These documents remain available to you throughout the conversation and you should use them fully.
+
+        HOW TO ANSWER QUESTIONS:
+
+        1. CONTENT AND STYLE
+        - Use plain, accessible language - avoid political jargon
+        - Break down complex legislative concepts
+        - Structure responses in short, clear paragraphs
+        - Include specific dates when referencing discussions
+        - Be factual and neutral in tone
+
+        2. USING CACHED DOCUMENTS
+        - Reference and quote directly from cached documents
+        - Cite specific dates and sessions when quoting
+        - Provide context for any technical terms or procedures
+        - Connect legislative discussions to real-world impacts
+
+        3. LEVEL OF DETAIL
+        - Start with a concise summary
+        - Add relevant details based on the question's scope
+        - If asked for more detail, provide comprehensive information
+        - Include specific examples from the documents when helpful
+
+        4. CLARITY AND COMPLETENESS
+        - If something is unclear in the documents, say so
+        - If multiple documents are relevant, synthesize the information
+        - Explain legislative procedures in citizen-friendly terms
+
+        Remember: Your audience is the average citizen who wants to understand their government's activities. Make complex
+        legislative information accessible while making full use of your cached documents.
+        """
+
+# Static part of the context relevance prompt, cached with the summaries
+_RELEVANCE_RUBRIC = """
+        CONTEXT RELEVANCE CHECK INSTRUCTIONS:
+        Follow these whenever you are asked for a CONTEXT RELEVANCE CHECK.
+
+        CONTEXT INFORMATION:
+        You have access to summaries of ALL documents in the format:
+        ***DOCUMENT {type} {id} START***
+        SUMMARY: [content summary]
+        ***DOCUMENT {type} {id} END***
+
+        Each numbered question comes with the COMPLETE documents currently loaded for its
+        conversation (the only documents available for detailed analysis), and the recent
+        conversation flow: previous questions from the user and the main assistant's answers.
+
+        EVALUATION STEPS:
+        1. READ the main assistant's last answer carefully - what information was already provided?
+        2. Review the conversation flow:
+        a) What did the user previously ask?
+        b) What specific information did the main assistant provide?
+        c) Does the answer contain ANY information about the new question's topic?
+        3. For the new question, check:
+        a) Does it ask for more details about something already mentioned?
+        b) Does it use words like "this" referring to previous content?
+        c) Is it asking to expand on a point already touched upon?
+        4. Important: If the previous answer contained ANY relevant information about the topic,
+        USE_CURRENT_CONTEXT to expand on that information before loading new context.
+
+        DECISION RULES:
+
+        USE_CURRENT_CONTEXT when ANY of these are true:
+        1. The main assistant's last answer contains ANY information about the topic being asked about
+        2. The question asks for more details/examples/explanation of something mentioned in the last answer
+        3. The question uses words like "this", "these", "those" referring to content from the last answer
+        4. The question is about reactions/responses/criticism/support related to what was just discussed
+        5. The question explicitly asks about current context
+
+        LOAD_NEW_CONTEXT only when ALL of these are true:
+        1. The main assistant's last answer contains NO information about the topic being asked about
+        2. The question asks about documents that aren't currently loaded
+        3. The question requires searching across a broader set of documents
+        4. The question introduces a completely new topic unrelated to the last answer
+        5. The question can't possibly be answered using information from current documents
+
+        EXAMPLES:
+
+        Example 1:
+        Previous Question: "What is Bill 118 about?"
+        Previous Answer: "Bill 118 establishes June 1st as Injured Workers Day..."
+        New Question: "Can you explain more about the workplace provisions in this bill?"
+        Current Documents: ["bill 118", "transcript 2023-10-23"]
+        Decision: USE_CURRENT_CONTEXT
+        Reasoning: Follows directly from previous Q&A about Bill 118's contents
+
+        Example 2:
+        Previous Question: "What does Bill 212 say about transportation?"
+        Previous Answer: "Bill 212 includes provisions about bicycle lanes that allow the province to override municipal decisions..."
+        New Question: "I'm concerned about the bicycle lane changes, can you provide more details?"
+        Current Documents: ["bill 212", "transcript 2024-11-21"]
+        Decision: USE_CURRENT_CONTEXT
+        Reasoning: Directly references information provided in last answer about bicycle lanes
+
+        Example 3:
+        Previous Question: "What did MPPs say about healthcare funding?"
+        Previous Answer: "During the May debates, MPPs discussed hospital funding..."
+        New Question: "What does Bill 124 say about nurses?"
+        Current Documents: ["transcript 2024-05-30"]
+        Decision: LOAD_NEW_CONTEXT
+        Reasoning: Switches from transcript discussions to requesting specific bill content not currently loaded
+
+        Example 4:
+        Previous Question: "What did the Premier say about healthcare?"
+        Previous Answer: "In the Question Period, Premier Ford highlighted investments including 12,500 licensed physicians and 100% match in residency positions..."
+        New Question: "Can you tell me more about the residency position expansion?"
+        Current Documents: ["transcript 2024-05-08", "transcript 2024-03-20"]
+        Decision: USE_CURRENT_CONTEXT
+        Reasoning: Asks for elaboration on specific detail mentioned in previous answer
+
+        Example 5:
+        Previous Question: "What were the key points in Bill 75?"
+        Previous Answer: "Bill 75 focuses on housing development regulations..."
+        New Question: "Are there any other bills about housing from this session?"
+        Current Documents: ["bill 75", "transcript 2024-03-15"]
+        Decision: LOAD_NEW_CONTEXT
+        Reasoning: Requires broader search across multiple bills beyond current context
+
+        Example 6:
+        Previous Question: "What bills are currently loaded?"
+        Previous Answer: "The currently loaded documents include Bill 124 and several transcripts..."
+        New Question: "What other bills mention healthcare?"
+        Current Documents: ["bill 124", "transcript 2024-05-30"]
+        Decision: LOAD_NEW_CONTEXT
+        Reasoning: Despite being related to current topic, explicitly requests other bills
+
+        Example 7:
+        Previous Question: "Tell me about the housing crisis discussion"
+        Previous Answer: "In these October sessions, MPPs debated housing affordability..."
+        New Question: "What else was said in these sessions?"
+        Current Documents: ["transcript 2023-10-23", "transcript 2023-10-24"]
+        Decision: USE_CURRENT_CONTEXT
+        Reasoning: Explicitly refers to "these sessions" in currently loaded transcripts
+
+        Example 8:
+        Previous Question: "What happened in the November 15th session?"
+        Previous Answer: "The November 15th session covered several topics including education funding..."
+        New Question: "Were there any bills introduced that day?"
+        Current Documents: ["transcript 2023-11-15"]
+        Decision: USE_CURRENT_CONTEXT
+        Reasoning: Asks about same session already loaded, just different aspect
+
+        Example 9:
+        Previous Question: "What did Minister Jones say about healthcare?"
+        Previous Answer: "Minister Jones discussed hospital funding and staffing initiatives..."
+        New Question: "Did any opposition members respond to these points?"
+        Current Documents: ["transcript 2024-05-30", "transcript 2024-05-31"]
+        Decision: USE_CURRENT_CONTEXT
+        Reasoning: Asks about responses to specific points in current transcripts
+
+        Example 10:
+        Previous Question: "What does the current context contain?"
+        Previous Answer: "Currently loaded documents include Bill 118 and transcript from October 23..."
+        New Question: "Great, can you search other transcripts for mentions of Bill 118?"
+        Current Documents: ["bill 118", "transcript 2023-10-23"]
+        Decision: LOAD_NEW_CONTEXT
+        Reasoning: Explicitly requests search beyond current documents
+
+        Example 11:
+        Previous Question: "What's in Bill 124?"
+        Previous Answer: "Bill 124 deals with healthcare worker compensation..."
+        New Question: "Show me what's currently loaded"
+        Current Documents: ["bill 124", "transcript 2024-05-30"]
+        Decision: USE_CURRENT_CONTEXT
+        Reasoning: Explicitly asks about current context contents
+
+        Example 12:
+        Previous Question: "Did they discuss climate change in October?"
+        Previous Answer: "Yes, in the October 23rd session, MPPs debated environmental policies..."
+        New Question: "What was said about this in other months?"
+        Current Documents: ["transcript 2023-10-23"]
+        Decision: LOAD_NEW_CONTEXT
+        Reasoning: "Other months" explicitly requests searching beyond current transcripts
+
+        RESPONSE FORMAT:
+        For each numbered question return USE_CURRENT_CONTEXT or LOAD_NEW_CONTEXT on its own line,
+        prefixed with the question number, e.g.
+        1: USE_CURRENT_CONTEXT
+        2: LOAD_NEW_CONTEXT
+        Do NOT include any other text, markdown formatting or backticks.
+"""
 """Some Gemini helper functions"""
 
 
@@ -35,11 +272,17 @@ def list_all_caches():
         print(c)
 
 
+def delete_caches(caches: list[genai.caching.CachedContent]) -> None:
+    """Delete caches concurrently, one request per thread"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as ex:
+        list(ex.map(lambda c: c.delete(), caches))
+
+
 def delete_all_caches():
     """Delete all active caches"""
-    for c in genai.caching.CachedContent.list():
-        c.delete()
-        print("deleted")
+    caches = list(genai.caching.CachedContent.list())
+    delete_caches(caches)
+    print(f"deleted {len(caches)} caches")
 
 
 """Some string formatting and cleaning functions"""
@@ -47,21 +290,10 @@ def delete_all_caches():
 
 def documents_to_string(documents: dict) -> str:
     """Takes a dictionary and combines every item into one giant string."""
-    outstring = ""
-    for doc_id, doc in documents.items():
-        outstring += (
-            f"*********************DOCUMENT {doc_id} START*********************\n"
-        )
-        outstring += f"ID: {doc_id}\n"
-        for k, v in doc.items():
-            outstring += f"{k.upper()}: {v}\n"
-        outstring += (
-            f"*********************DOCUMENT {doc_id} END*********************\n\n\n\n"
-        )
-    return outstring
+    return "".join([document_to_string(k, v) for k, v in documents.items()])
 
 
-def parse_llm_json(response: str) -> str:
+def parse_llm_json(response: str) -> dict | list:
     """Parses the JSON content from a poorly formatter LLM response.
 
     Sometimes, despite how much prompt torturing you do, the LLM returns, e.g.
@@ -72,18 +304,163 @@ def parse_llm_json(response: str) -> str:
 
     where the backticks and 'json' are literally in the string.
     This utility function will try to parse an LLM response as a json string.
-    And it will also handle that annoying case where the markdown is included.
+    It decodes the first JSON object or array in the response and ignores anything around it,
+    so markdown fences, preambles and trailing text are all handled. A bracket that does not
+    start valid JSON, like one in a preamble, is skipped.
     """
-    cleaned = response.strip()
-    if cleaned.startswith("```"):
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]  # Remove ```json
-        else:
-            cleaned = cleaned[3:]  # Remove ```
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]  # Remove closing ```
-        cleaned = cleaned.strip()
-    return json.loads(cleaned)  # Parse to dict
+    decoder = json.JSONDecoder()
+    for match in JSON_START_PATTERN.finditer(response):
+        try:
+            obj, _ = decoder.raw_decode(response, match.start())
+        except ValueError:
+            continue
+        return obj
+    return json.loads(response)  # Nothing decodes, raise the usual decode error
+
+
+class BatchedRetrievalGate:
+    """Coalesces concurrent context relevance checks into a single retrieval model call.
+
+    Checks submitted within `batch_wait_timeout_s` of each other (up to `max_batch`) are sent
+    as one numbered prompt, and each caller gets back the decision for its own question. A check
+    that finds nothing else queued is sent right away. The worker task is started by the first
+    submission and exits once the queue is drained.
+
+    Batching needs several chat sessions, so one gate is shared by the bots serving them (see
+    the `relevance_gate` argument of `OLABot`). The bots must be built from the same summaries,
+    since every batch is sent to the model returned by `get_model`, and driven from one event
+    loop with `chat_interface_async`.
+
+    Attributes:
+        max_batch (int): Maximum number of questions sent in one call.
+        batch_wait_timeout_s (float): How long to wait for more questions before sending a batch.
+
+    Args:
+        get_model (Callable): Returns the retrieval model (called once per batch).
+        max_batch (int, optional): Defaults to 8.
+        batch_wait_timeout_s (float, optional): Defaults to 0.05.
+    """
+
+    def __init__(
+        self,
+        get_model: Callable[[], genai.GenerativeModel],
+        max_batch: int = 8,
+        batch_wait_timeout_s: float = 0.05,
+    ):
+        self.get_model = get_model
+        self.max_batch = max_batch
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self._queue = None
+        self._worker = None
+
+    async def submit(self, question: str, context: str) -> str:
+        """Queue a relevance check and wait for its decision.
+
+        Args:
+            question (str): The new user question.
+            context (str): The loaded documents and conversation history of the asking session.
+
+        Returns:
+            str: "USE_CURRENT_CONTEXT" or "LOAD_NEW_CONTEXT".
+        """
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self.worker())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((question, context, future))
+        return await future
+
+    async def worker(self) -> None:
+        """Collect and send batches until the queue is empty.
+
+        If the worker is cancelled or fails, so are the checks it holds and those still queued.
+        """
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                # Only wait for more checks when others are already queued
+                if not self._queue.empty():
+                    deadline = loop.time() + self.batch_wait_timeout_s
+                    await self._fill_batch(batch, deadline)
+
+                try:
+                    decisions = await self._decide(batch)
+                except Exception as e:  # noqa: BLE001
+                    decisions = [e] * len(batch)
+                self._resolve(batch, decisions)
+                batch = []
+
+                if self._queue.empty():
+                    return
+        except BaseException as e:
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._resolve(batch, [e] * len(batch))
+            raise
+        finally:
+            self._worker = None
+
+    async def _fill_batch(self, batch: list[tuple], deadline: float) -> None:
+        """Add queued checks to `batch` until it is full or `deadline` (loop time) passes."""
+        loop = asyncio.get_running_loop()
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(
+                    await asyncio.wait_for(
+                        self._queue.get(),
+                        max(deadline - loop.time(), 0),
+                    ),
+                )
+            except TimeoutError:
+                break
+
+    def _resolve(self, batch: list[tuple], decisions: list) -> None:
+        """Hand each caller its decision, or the error (a cancellation cancels the caller)."""
+        for (_, _, future), decision in zip(batch, decisions, strict=True):
+            if future.done():  # caller was cancelled
+                continue
+            if isinstance(decision, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(decision, BaseException):
+                future.set_exception(decision)
+            else:
+                future.set_result(decision)
+
+    async def _decide(self, batch: list[tuple]) -> list[str]:
+        """Send one prompt for the whole batch and split the answer back into decisions."""
+        cases = "\n".join(
+            f"""
+        QUESTION {i}: "{question}"
+        {context}"""
+            for i, (question, context, _) in enumerate(batch, start=1)
+        )
+
+        # The instructions are cached with the summaries, only the questions are sent
+        prompt = f"""
+        CONTEXT RELEVANCE CHECK: follow the CONTEXT RELEVANCE CHECK INSTRUCTIONS in your context.
+
+        Below are {len(batch)} numbered questions. Each one comes from a separate conversation, with
+        its own currently loaded documents and conversation history. Evaluate every question
+        independently, using only its own documents and history.
+        {cases}
+        """
+
+        response = await self.get_model().generate_content_async(prompt)
+        decisions = {}
+        for line in response.text.splitlines():
+            match = re.match(
+                r"\W*(\d+)\W+(USE_CURRENT_CONTEXT|LOAD_NEW_CONTEXT)",
+                line.strip(),
+            )
+            if match:
+                decisions[int(match.group(1))] = match.group(2)
+
+        # Questions the model skipped fall back to loading new context
+        return [
+            decisions.get(i, "LOAD_NEW_CONTEXT") for i in range(1, len(batch) + 1)
+        ]
 
 
 class OLABot:
@@ -103,98 +480,188 @@ class OLABot:
     Attributes:
         MAX_DOCUMENT_CONTEXT (int): The number of transcript files the model can store.
         CACHE_TTL_MINUTES (int): Cache time-to-live in minutes.
-        RETRIEVAL_MODEL_NAME (str): The retrieval model (current set to "models/gemini-1.5-flash-8b").
+        RETRIEVAL_MODEL_NAME (str): The retrieval model (current set to "models/gemini-2.5-flash-lite").
         MAIN_MODEL_NAME (str): The main model (currently set to models/gemini-1.5-flash-002).
+        EMBEDDING_MODEL_NAME (str): The embedding model used for local relevance checks.
+        RELEVANCE_THRESHOLD (float): Similarity at or above which the current context is reused.
+        RELEVANCE_AMBIGUOUS_THRESHOLD (float): Similarity below which new context is loaded. Scores
+            between the two thresholds are sent to the retrieval model.
+        RECENT_TURNS (int): Number of answered questions kept for relevance checks.
+        ANSWER_HEAD_CHARS (int): Characters of each answer kept in the relevance check history.
+        MIN_CACHEABLE_TOKENS (int): Contexts with fewer tokens are sent without a cache.
+        SELECTION_THRESHOLD (float): Best summary similarity below which embedding matches are
+            ignored. If keyword matches are ignored too, the retrieval model selects documents.
+        RECENCY_WEIGHT (float): Weight of document recency when ranking selected documents.
+        BM25_THRESHOLD (float): Best keyword score below which keyword matches are ignored.
+        RRF_K (int): Rank offset used when fusing the embedding and keyword rankings.
+        RRF_CANDIDATES (int): Number of documents taken from each ranking before fusing.
+        KEYWORD_RELEVANCE_THRESHOLD (float): Keyword score ratio (loaded documents vs all documents)
+            above which an ambiguous question reuses the current context. Also the share of
+            question keywords found in the last answer above which the context is always reused.
+        KEYWORD_AMBIGUOUS_THRESHOLD (float): Keyword score ratio below which an ambiguous question
+            loads new context.
+        CONTEXT_CACHE_LRU_SIZE (int): Number of main model caches kept for reuse.
         debug (bool): Flag to enable or disable debug mode.
         streaming (bool): Flag to enable or disable streaming mode.
-        documents (dict): Loaded documents data.
-        summaries (dict): Loaded summaries data.
+        doc_blobs (_SqliteDict): Each document formatted with `document_to_string`, keyed by
+            document id and read on demand from the SQLite document store (see build_index.py).
+        doc_token_counts (dict): Gemini token count of each entry in `doc_blobs` (see build_index.py).
+        summaries (dict): Summaries data.
+        bm25 (BM25Okapi): Keyword index over the summaries, in the row order of `summary_ids`.
+        summary_ids (list): Document ids, in the row order of `summary_embeddings`.
+        summary_embeddings (np.ndarray): Memory-mapped, int8-quantized embeddings of every
+            summary (see build_index.py).
+        summary_scale (np.ndarray): Per-dimension scales, `summary_embeddings / summary_scale`
+            gives back the L2-normalized embeddings.
+        current_doc_embeddings (np.ndarray): Rows of `summary_embeddings` for the current documents.
         available_dates (list): Sorted list of available transcript dates.
-        available_bills (list): Sorted list of available bill numbers.
+        available_bills (list): Numerically sorted list of available bill numbers.
         current_document_ids (list): List of current document IDs.
-        current_context (str): Current context string for the main chatbot.
         model (object): Main chatbot model.
-        current_context_cache (object): Cache for the current context.
-        retrieval_model (object): Context checking model.
-        summaries_cache (object): Cache for the summaries.
+        current_context_cache (object | None): Cache for the current context, None if it is too
+            small to cache.
+        context_caches (OrderedDict): Recently used (model, cache) pairs, keyed by the frozenset
+            of their document ids, least recently used first.
+        retrieval_model (object | None): Context checking model with all summaries as its system
+            instruction, created on first use.
+        selection_model (object): Retrieval model without the summaries, that selects among
+            shortlisted summaries.
 
     Args:
         documents_path (Path): Path to the documents file.
         summaries_path (Path): Path to the summaries file.
         debug (bool, optional): Flag to enable or disable debug mode. Defaults to False.
         streaming (bool, optional): Flag to enable or disable streaming mode. Defaults to True.
+        relevance_gate (BatchedRetrievalGate, optional): Gate shared with other bots, so their
+            concurrent relevance checks are batched. Defaults to a gate of this bot's own.
     """
 
+    _DOC_ID_RE = re.compile(r"transcript \d{4}-\d{2}-\d{2}|bill \d+")
+    # Requests to look beyond the loaded documents
+    _NEW_CONTEXT_RE = re.compile(
+        r"\b(?:search all|(?:all|other) (?:meetings|transcripts|documents|bills)|forget|new topic|"
+        r"different topic|something else)\b",
+        re.IGNORECASE,
+    )
+    # Bills and sitting dates named in a question
+    _QUESTION_REF_RE = re.compile(r"\bbill\s+(\d+)|\b(\d{4}-\d{2}-\d{2})\b", re.IGNORECASE)
+
+    # Fixed attribute layout, the hot paths read these on every turn
+    __slots__ = (
+        "ANSWER_HEAD_CHARS",
+        "BM25_THRESHOLD",
+        "CACHE_TTL_MINUTES",
+        "CONTEXT_CACHE_LRU_SIZE",
+        "EMBEDDING_MODEL_NAME",
+        "KEYWORD_AMBIGUOUS_THRESHOLD",
+        "KEYWORD_RELEVANCE_THRESHOLD",
+        "MAIN_MODEL_NAME",
+        "MAX_DOCUMENT_CONTEXT",
+        "MIN_CACHEABLE_TOKENS",
+        "RECENCY_WEIGHT",
+        "RECENT_TURNS",
+        "RELEVANCE_AMBIGUOUS_THRESHOLD",
+        "RELEVANCE_THRESHOLD",
+        "RETRIEVAL_MODEL_NAME",
+        "RRF_CANDIDATES",
+        "RRF_K",
+        "SELECTION_THRESHOLD",
+        "_doc_id_set",
+        "_last_answer_tokens",
+        "_last_query_embedding",
+        "_loop",
+        "_recent_turn_embeddings",
+        "_recent_turns",
+        "_relevance_gate",
+        "_store",
+        "_summary_recency",
+        "_summary_rows",
+        "available_bills",
+        "available_dates",
+        "bm25",
+        "chat_session",
+        "context_caches",
+        "current_context_cache",
+        "current_doc_embeddings",
+        "current_document_ids",
+        "debug",
+        "doc_blobs",
+        "doc_token_counts",
+        "model",
+        "retrieval_model",
+        "selection_model",
+        "streaming",
+        "summaries",
+        "summary_embeddings",
+        "summary_ids",
+        "summary_scale",
+    )
+
     def __init__(
         self,
         documents_path: Path,
         summaries_path: Path,
         debug: bool = False,
         streaming: bool = True,
+        relevance_gate: BatchedRetrievalGate | None = None,
     ):
         """Initialize the Ontario Legislature Assistant Bot."""
 
         # Constants
         self.MAX_DOCUMENT_CONTEXT = 5  # The number of transcript files #FIXME this should really be max cached size or something
         self.CACHE_TTL_MINUTES = 60  # Cache time-to-live in minutes
-        self.RETRIEVAL_MODEL_NAME = "models/gemini-1.5-flash-8b"
+        self.RETRIEVAL_MODEL_NAME = "models/gemini-2.5-flash-lite"
         self.MAIN_MODEL_NAME = "models/gemini-1.5-flash-002"
+        self.EMBEDDING_MODEL_NAME = build_index.EMBEDDING_MODEL_NAME
+        self.RELEVANCE_THRESHOLD = 0.70
+        self.RELEVANCE_AMBIGUOUS_THRESHOLD = 0.55
+        self.RECENT_TURNS = 3
+        self.SELECTION_THRESHOLD = 0.55
+        self.RECENCY_WEIGHT = 0.2
+        self.BM25_THRESHOLD = 3.0
+        self.RRF_K = 60
+        self.RRF_CANDIDATES = 20
+        self.KEYWORD_RELEVANCE_THRESHOLD = 0.8
+        self.KEYWORD_AMBIGUOUS_THRESHOLD = 0.5
+        self.CONTEXT_CACHE_LRU_SIZE = 4
+        self.ANSWER_HEAD_CHARS = 300
+        self.MIN_CACHEABLE_TOKENS = 32768  # Gemini 1.5 minimum for explicit caching
 
         # Settings
         self.debug = debug
         self.streaming = streaming
 
         # Load data
-        if isinstance(documents_path, str):
-            documents_path = Path(documents_path)
-        with documents_path.open(encoding="utf-8") as f:
-            self.documents = json.load(f)
-
-        if isinstance(summaries_path, str):
-            summaries_path = Path(summaries_path)
-        with summaries_path.open(encoding="utf-8") as f:
-            self.summaries = json.load(f)
+        self._load_documents(documents_path)
+        self._load_summaries(summaries_path)
+        self._summary_recency = self._recency_scores()
 
-        # Get the date range of available transcripts
-        available_dates = [
-            v["id_number"] for v in self.documents.values() if v["type"] == "transcript"
-        ]
-        self.available_dates = sorted(available_dates)
-
-        # Get the bills numbers for the available documents
-        available_bills = [
-            v["id_number"] for v in self.documents.values() if v["type"] == "bill"
-        ]
-        self.available_bills = sorted(available_bills)
+        # Recent turns, for the relevance checks
+        self._last_query_embedding = (None, None)
+        self._recent_turn_embeddings = deque(maxlen=self.RECENT_TURNS)
+        self._recent_turns = deque(maxlen=2 * self.RECENT_TURNS)
+        self._last_answer_tokens = set()
 
         # Create context for the main chatbot
         # initilized to the three most recent transcripts
         self.current_document_ids = [
             f"transcript {d}" for d in self.available_dates[-3:]
         ]
-        self.current_context = documents_to_string(
-            {k: self.documents[k] for k in self.current_document_ids},
-        )
+        self.current_doc_embeddings = self._current_embeddings()
 
         # Initialize main chatbot
         self._print_debug(
             f"Initializing model with {', '.join(self.current_document_ids)}",
         )
-        self.model, self.current_context_cache = self._create_cached_model(
-            model_name=self.MAIN_MODEL_NAME,
-            display_name="OLABot",
-            contents=[self.current_context],
-            temperature=1,
-            max_output_tokens=8192,
-        )
-
-        # Initialize context checking model
-        self.retrieval_model, self.summaries_cache = self._create_cached_model(
-            model_name=self.RETRIEVAL_MODEL_NAME,
-            display_name="OLABot Retrieval Helper",
-            contents=[documents_to_string(self.summaries)],
-            temperature=1,
-            max_output_tokens=1024,
+        self.context_caches = OrderedDict()
+        self.model, self.current_context_cache = self._get_context_model()
+
+        # Context checking model, created by _get_retrieval_model on first use
+        self.retrieval_model = None
+        # Retrieval model without the summaries, for choosing among shortlisted summaries
+        self.selection_model = genai.GenerativeModel(self.RETRIEVAL_MODEL_NAME)
+        self._relevance_gate = relevance_gate or BatchedRetrievalGate(
+            self._get_retrieval_model,
         )
 
         # Create the initial chat session
@@ -204,6 +671,76 @@ class OLABot:
         self.chat_session = None
         self._initialize_chat_session()
 
+        # Event loop that drives the async chat interface. It is kept for the life of the
+        # bot because the async Gemini clients are bound to the loop they were created on
+        self._loop = asyncio.new_event_loop()
+
+    #
+    # LOADING METHODS
+    #
+    def _load_documents(self, documents_path: Path) -> None:
+        """Open the document store and token counts, rebuilding them if they are out of date."""
+        # Documents are pre-formatted into an SQLite store (rebuilt whenever the
+        # documents file changes) and read one at a time when they are loaded
+        if isinstance(documents_path, str):
+            documents_path = Path(documents_path)
+        store_path = build_index.document_store_path(documents_path)
+        if build_index.is_out_of_date(documents_path, store_path):
+            self._print_debug("Document store missing or out of date, building it")
+            build_index.build_document_store(documents_path)
+        self._store = sqlite3.connect(f"file:{store_path}?mode=ro", uri=True)
+        self.doc_blobs = _SqliteDict(self._store)
+
+        # Token counts of those blobs, recounted whenever the documents file changes
+        token_counts_path = build_index.token_counts_path(documents_path)
+        if build_index.is_out_of_date(documents_path, token_counts_path):
+            self._print_debug("Token counts missing or out of date, counting them")
+            build_index.build_token_counts(documents_path)
+        with token_counts_path.open(encoding="utf-8") as f:
+            self.doc_token_counts = json.load(f)
+
+        # Get the ids, transcript dates and bill numbers of the available documents
+        self.available_dates, self.available_bills = [], []
+        self._doc_id_set = set()
+        for doc_id, doc_type, id_number in self._store.execute(
+            "SELECT id, type, id_number FROM documents",
+        ):
+            self._doc_id_set.add(doc_id)
+            if doc_type == "transcript":
+                self.available_dates.append(id_number)
+            elif doc_type == "bill":
+                self.available_bills.append(id_number)
+        self.available_dates.sort()
+        self.available_bills.sort(key=int)
+
+    def _load_summaries(self, summaries_path: Path) -> None:
+        """Load the summaries with their embedding and keyword indexes."""
+        if isinstance(summaries_path, str):
+            summaries_path = Path(summaries_path)
+        with summaries_path.open(encoding="utf-8") as f:
+            self.summaries = json.load(f)
+
+        # Memory-map the summary embeddings, (re)building the index whenever the summaries
+        # file changes
+        index_paths = build_index.index_paths(summaries_path)
+        if build_index.is_out_of_date(summaries_path, *index_paths):
+            self._print_debug("Summary index missing or out of date, building it")
+            build_index.build_index(summaries_path)
+        embeddings_path, scale_path, ids_path = index_paths
+        self.summary_embeddings = np.load(embeddings_path, mmap_mode="r")
+        self.summary_scale = np.load(scale_path)
+        with ids_path.open(encoding="utf-8") as f:
+            self.summary_ids = json.load(f)
+        self._summary_rows = {k: i for i, k in enumerate(self.summary_ids)}
+
+        # Keyword index over the same summaries, catches exact bill numbers and names
+        self.bm25 = BM25Okapi(
+            [
+                build_index.tokenize(build_index.summary_to_string(k, self.summaries[k]))
+                for k in self.summary_ids
+            ],
+        )
+
     #
     # PRINTING METHODS
     #
@@ -212,20 +749,19 @@ class OLABot:
         time = datetime.datetime.now(tz=TZ).time()
         if self.debug:
             print(
-                f"\n{Fore.YELLOW}{Style.DIM}Debug [{time}]\n{message}{Style.RESET_ALL}"
+                f"\n{Fore.YELLOW}{Style.DIM}Debug [{time}]\n{message}{Style.RESET_ALL}",
             )
 
-    def _format_usage_stats(self, usage_stats: dict) -> None:
-        """Prints formatted usage statistics for a Gemini API call using _print_debug."""
-        operation_name = (
-            f"{Fore.RED}{Style.DIM}{inspect.stack()[1][3]}{Fore.YELLOW}{Style.DIM}"
-        )
+    def _format_usage_stats(self, usage_stats: dict, op: str) -> str:
+        """Formats usage statistics of a Gemini API call, for printing with _print_debug."""
+        operation_name = f"{Fore.RED}{Style.DIM}{op}{Fore.YELLOW}{Style.DIM}"
 
         stats_message = (
             f"{operation_name} usage stats:\n"
             f"\tprompt_token_count: {usage_stats.prompt_token_count}\n"
             f"\tcandidates_token_count: {usage_stats.candidates_token_count}\n"
-            f"\ttotal_token_count: {usage_stats.total_token_count}"
+            f"\ttotal_token_count: {usage_stats.total_token_count}\n"
+            f"\tcached_content_token_count: {usage_stats.cached_content_token_count}"
         )
 
         return stats_message
@@ -243,14 +779,16 @@ class OLABot:
     def print_response(self, response: str | Generator) -> None:
         """Prints bot response with styling."""
         if self.streaming:
-            # Print assistant prefix only once
-            print(f"\n{Fore.BLUE}🤖 OLABot: {Style.NORMAL}", end="", flush=True)
+            # Set the colour once, then write the chunks as they are
+            write, flush = sys.stdout.write, sys.stdout.flush
+            write(f"\n{Fore.BLUE}🤖 OLABot: {Style.NORMAL}")
             for chunk in response:
-                print(f"{Fore.BLUE}{chunk}", end="", flush=True)
-            print(f"\n\n{Style.DIM}---{Style.RESET_ALL}")  # Separator line
+                write(chunk)
+                flush()
+            write(f"\n\n{Style.DIM}---{Style.RESET_ALL}\n")  # Separator line
         else:
             print(
-                f"\n{Fore.BLUE}🤖 OLABot: {Style.NORMAL}{response}{Style.RESET_ALL}\n"
+                f"\n{Fore.BLUE}🤖 OLABot: {Style.NORMAL}{response}{Style.RESET_ALL}\n",
             )
             print(f"{Style.DIM}---{Style.RESET_ALL}")  # Separator line
 
@@ -262,6 +800,7 @@ class OLABot:
         model_name: str,
         display_name: str,
         contents: list[str],
+        system_instruction: str | None = None,
         **kwargs,
     ) -> tuple[genai.GenerativeModel, genai.caching.CachedContent | None]:
         """Create a Gemini model with cached content.
@@ -270,6 +809,7 @@ class OLABot:
             model_name (str): Name of the Gemini model to use
             display_name (str): Display name for the cached content
             contents (List[str]): List of content strings to cache
+            system_instruction (str, optional): System instruction to cache with the contents
             **kwargs: Additional configuration parameters for the model
 
         Returns:
@@ -280,6 +820,7 @@ class OLABot:
         cached_content = genai.caching.CachedContent.create(
             model=model_name,
             display_name=display_name,
+            system_instruction=system_instruction,
             contents=contents,
             ttl=datetime.timedelta(minutes=self.CACHE_TTL_MINUTES),
         )
@@ -293,288 +834,372 @@ class OLABot:
 
         return model, cached_content
 
-    def _initialize_chat_session(
+    def _get_context_model(
         self,
-        previous_history: list[dict] | None = None,
-    ):
-        """Initialize chat with system prompt and optional previous history.
+    ) -> tuple[genai.GenerativeModel, genai.caching.CachedContent | None]:
+        """Return the main model and cache for `current_document_ids`.
 
-        Resets self.chat_session.
-        """
+        Caches are kept in a small LRU keyed by their set of document ids, so switching back to a
+        recent set of documents (in any order) only refreshes the cache TTL instead of uploading
+        it again. The context text is only joined when a new cache is needed. The least recently
+        used cache is deleted once the LRU is full.
 
-        system_prompt = """
-        You are a helpful assistant making the Ontario Legislative Assembly more accessible to average citizens.
+        Contexts below `MIN_CACHEABLE_TOKENS` cannot be cached, so they are given to an uncached
+        model as part of its system instruction and no cache is returned.
 
-        IMPORTANT: You have persistent access to cached Ontario Legislative Assembly documents, including transcripts and bills.
-        These documents remain available to you throughout the conversation and you should use them fully.
+        The system prompt is always the model's system instruction, never part of the chat history.
+        """
+        total_tokens = sum(self.doc_token_counts[k] for k in self.current_document_ids)
+        if total_tokens < self.MIN_CACHEABLE_TOKENS:
+            self._print_debug(f"Context has {total_tokens} tokens, not caching it")
+            model = genai.GenerativeModel(
+                model_name=self.MAIN_MODEL_NAME,
+                generation_config={
+                    "response_mime_type": "text/plain",
+                    "temperature": 1,
+                    "max_output_tokens": 8192,
+                },
+                system_instruction=f"{_SYSTEM_PROMPT}\n{self._join_context()}",
+            )
+            return model, None
+
+        key = frozenset(self.current_document_ids)
+
+        if key in self.context_caches:
+            model, cached_content = self.context_caches[key]
+            try:
+                cached_content.update(
+                    ttl=datetime.timedelta(minutes=self.CACHE_TTL_MINUTES),
+                )
+            except Exception as e:  # noqa: BLE001
+                # Most likely expired on the server, recreate it below
+                self._print_debug(f"Could not reuse cache: {e}")
+                del self.context_caches[key]
+            else:
+                self.context_caches.move_to_end(key)
+                self._print_debug("Reusing cached model: OLABot")
+                return model, cached_content
 
-        HOW TO ANSWER QUESTIONS:
+        model, cached_content = self._create_cached_model(
+            model_name=self.MAIN_MODEL_NAME,
+            display_name="OLABot",
+            contents=[self._join_context()],
+            system_instruction=_SYSTEM_PROMPT,
+            temperature=1,
+            max_output_tokens=8192,
+        )
+        self.context_caches[key] = (model, cached_content)
 
-        1. CONTENT AND STYLE
-        - Use plain, accessible language - avoid political jargon
-        - Break down complex legislative concepts
-        - Structure responses in short, clear paragraphs
-        - Include specific dates when referencing discussions
-        - Be factual and neutral in tone
+        if len(self.context_caches) > self.CONTEXT_CACHE_LRU_SIZE:
+            _, (_, old_cache) = self.context_caches.popitem(last=False)
+            old_cache.delete()
+            self._print_debug("Deleted least recently used cache")
 
-        2. USING CACHED DOCUMENTS
-        - Reference and quote directly from cached documents
-        - Cite specific dates and sessions when quoting
-        - Provide context for any technical terms or procedures
-        - Connect legislative discussions to real-world impacts
+        return model, cached_content
 
-        3. LEVEL OF DETAIL
-        - Start with a concise summary
-        - Add relevant details based on the question's scope
-        - If asked for more detail, provide comprehensive information
-        - Include specific examples from the documents when helpful
+    def _get_retrieval_model(self) -> genai.GenerativeModel:
+        """Return the retrieval model, created with the summaries and the relevance rubric on first use.
 
-        4. CLARITY AND COMPLETENESS
-        - If something is unclear in the documents, say so
-        - If multiple documents are relevant, synthesize the information
-        - Explain legislative procedures in citizen-friendly terms
+        The summaries and rubric are the system instruction of every retrieval call, so each call
+        starts with the same prefix and Gemini's implicit caching discounts it. This avoids the
+        storage cost and the create call of an explicit cache.
+        """
+        if self.retrieval_model is None:
+            self.retrieval_model = genai.GenerativeModel(
+                model_name=self.RETRIEVAL_MODEL_NAME,
+                generation_config={
+                    "response_mime_type": "text/plain",
+                    "temperature": 1,
+                    "max_output_tokens": 1024,
+                },
+                system_instruction=documents_to_string(self.summaries)
+                + _RELEVANCE_RUBRIC,
+            )
+            self._print_debug("Created model: OLABot Retrieval Helper")
+        return self.retrieval_model
 
-        Remember: Your audience is the average citizen who wants to understand their government's activities. Make complex
-        legislative information accessible while making full use of your cached documents.
+    def _initialize_chat_session(self):
+        """Initialize an empty chat, the system prompt is the model's system instruction.
+
+        Resets self.chat_session.
         """
 
-        initial_history = [
-            {"role": "user", "parts": system_prompt},
-            {"role": "model", "parts": "I understand my role and guidelines."},
-        ]
+        self._print_debug("Initialized chat")
+        self.chat_session = self.model.start_chat()
 
-        if previous_history:
-            initial_history.extend(previous_history)
+    #
+    # EMBEDDING METHODS
+    #
+    async def _embed_query(self, question: str) -> np.ndarray:
+        """Embed a question, reusing the last embedding if the question is unchanged.
 
-        if not previous_history:
-            self._print_debug("Initialized chat with system prompt")
-        else:
-            self._print_debug("Carried over previous history")
+        The embedding call runs in a worker thread, so it does not block the event loop.
+        """
+        if self._last_query_embedding[0] != question:
+            embedding = await asyncio.to_thread(
+                build_index.embed,
+                question,
+                task_type="retrieval_query",
+            )
+            self._last_query_embedding = (question, embedding)
+        return self._last_query_embedding[1]
 
-        self.chat_session = self.model.start_chat(history=initial_history)
+    def _recency_scores(self) -> np.ndarray:
+        """Score each summary from 0 (oldest) to 1 (newest) within its document type.
+
+        Transcripts are ordered by date and bills by bill number.
+        """
+        dates = {f"transcript {d}": i for i, d in enumerate(self.available_dates)}
+        bills = {f"bill {b}": i for i, b in enumerate(self.available_bills)}
+        recency = np.zeros(len(self.summary_ids), dtype=np.float32)
+        for row, doc_id in enumerate(self.summary_ids):
+            if doc_id in dates:
+                recency[row] = dates[doc_id] / max(len(dates) - 1, 1)
+            elif doc_id in bills:
+                recency[row] = bills[doc_id] / max(len(bills) - 1, 1)
+        return recency
+
+    def _current_embeddings(self) -> np.ndarray:
+        """Slice the summary embeddings of the currently loaded documents."""
+        rows = [self._summary_rows[k] for k in self.current_document_ids]
+        return self.summary_embeddings[rows] / self.summary_scale
 
     #
     # CONTEXT METHODS
     #
+    def _join_context(self) -> str:
+        """Join the pre-formatted blobs of the current documents into one context string."""
+        return "".join([self.doc_blobs[k] for k in self.current_document_ids])
+
     def _update_current_context(self, document_ids: list[str]) -> None:
-        """Update the current chat context."""
-        self.current_document_ids = document_ids[: self.MAX_DOCUMENT_CONTEXT]
-        self.current_context = documents_to_string(
-            {k: self.documents[k] for k in self.current_document_ids}
-        )
+        """Update the current chat context.
 
-        # Save previous history
-        previous_history = (
-            self.chat_session.history[2:] if hasattr(self, "chat_session") else None
-        )
+        Does nothing if the documents are already loaded, in any order.
+        """
+        document_ids = document_ids[: self.MAX_DOCUMENT_CONTEXT]
+        if set(document_ids) == set(self.current_document_ids):
+            self._print_debug("Documents already loaded, keeping the current context")
+            return
 
-        # Delete old cache if it exists
-        if hasattr(self, "current_context_cache"):
-            self.current_context_cache.delete()
-            self._print_debug("Deleted old cache")
+        self.current_document_ids = document_ids
+        self.current_doc_embeddings = self._current_embeddings()
+        self._recent_turn_embeddings.clear()
 
-        # Create new model using helper function
-        self.model, self.current_context_cache = self._create_cached_model(
-            model_name=self.MAIN_MODEL_NAME,
-            display_name="OLABot",
-            contents=[self.current_context],
-            temperature=1,
-            max_output_tokens=8192,
-        )
+        # Reuse a recent cache of the same documents, or create a new one
+        self.model, self.current_context_cache = self._get_context_model()
 
-        # Initialize chat with new context and previous history
-        self._initialize_chat_session(previous_history)
+        # Rebind the chat to the new model, passing the history protos
+        # as they are instead of rebuilding them
+        self.chat_session = self.model.start_chat(history=self.chat_session.history)
+        self._print_debug("Carried over previous history")
 
-    def _check_context_relevance(self, question: str) -> bool:
-        """Check if the current context can answer the new question."""
+    async def _check_context_relevance(self, question: str) -> bool:
+        """Check if the current context can answer the new question.
 
-        # No context to answer the question
-        if self.current_document_ids == []:
-            return False
+        Uses `_local_context_relevance`, and the retrieval model if that is undecided. `_route`
+        makes the same checks itself, so it can share one retrieval model call with selection.
+        """
+        decision = await self._local_context_relevance(question)
+        if decision is None:
+            return await self._llm_check_context_relevance(question)
+        return decision
 
-        # Get conversation history from chat
-        conversation_history = (
-            "\n".join(
-                [
-                    f"Previous {msg.role}: {msg.parts[0].text}"
-                    for msg in self.chat_session.history[2:]
-                ]  # Skip system prompt
-            )
-            if self.chat_session.history
-            else ""
-        )
+    async def _local_context_relevance(self, question: str) -> bool | None:
+        """Check locally if the current context can answer the new question.
 
-        prompt = f"""
-        QUESTION: "{question}"
+        The question embedding is compared against the summaries of the loaded documents and
+        the questions recently answered from them. Similarities between the two relevance
+        thresholds are resolved with keywords where possible: the best BM25 score among the
+        loaded documents relative to the best score over all documents, and the share of question
+        keywords found in the last answer. A question that mostly repeats words of the last answer
+        always keeps the context.
 
-        CONTEXT INFORMATION:
-        1. You have access to summaries of ALL documents in the format:
-        ***DOCUMENT {{type}} {{id}} START***
-        SUMMARY: [content summary]
-        ***DOCUMENT {{type}} {{id}} END***
+        Before any of that, a follow-up without content words ("Why?", "Tell me more about that")
+        keeps the context. Explicit requests to look elsewhere are handled by `_route`.
 
-        2. Currently loaded COMPLETE documents: {', '.join(self.current_document_ids)}
-        (These are the only documents available for detailed analysis)
+        Returns None when neither embeddings nor keywords settle it.
+        """
 
-        3. CONVERSATION FLOW in history:
-        - Previous questions from the user
-        - The main assistant's answers to those questions
-        - Most recent exchange used these loaded documents
-        {conversation_history}
+        # No context to answer the question
+        if self.current_document_ids == []:
+            return False
 
-        EVALUATION STEPS:
-        1. READ the main assistant's last answer carefully - what information was already provided?
-        2. Review the conversation flow:
-        a) What did the user previously ask?
-        b) What specific information did the main assistant provide?
-        c) Does the answer contain ANY information about the new question's topic?
-        3. For the new question, check:
-        a) Does it ask for more details about something already mentioned?
-        b) Does it use words like "this" referring to previous content?
-        c) Is it asking to expand on a point already touched upon?
-        4. Important: If the previous answer contained ANY relevant information about the topic,
-        USE_CURRENT_CONTEXT to expand on that information before loading new context.
+        # Follow-ups with only stopwords can only be about the conversation so far
+        tokens = build_index.tokenize(question)
+        if not tokens and self._recent_turns:
+            self._print_debug("Follow-up without keywords, keeping the context")
+            return True
+
+        query_embedding = await self._embed_query(question)
+        candidates = self.current_doc_embeddings
+        if self._recent_turn_embeddings:
+            candidates = np.vstack([candidates, *self._recent_turn_embeddings])
+        similarity = float((candidates @ query_embedding).max())
+
+        keyword_ratio = self._keyword_ratio(tokens)
+        answer_overlap = (
+            len(self._last_answer_tokens.intersection(tokens)) / len(set(tokens))
+            if tokens
+            else 0
+        )
+        self._print_debug(
+            f"Checking context relevance similarity: {similarity:.3f}, "
+            f"keyword ratio: {keyword_ratio}, answer overlap: {answer_overlap:.2f}",
+        )
 
-        DECISION RULES:
+        if (
+            similarity >= self.RELEVANCE_THRESHOLD
+            or answer_overlap > self.KEYWORD_RELEVANCE_THRESHOLD
+        ):
+            return True
+        if similarity < self.RELEVANCE_AMBIGUOUS_THRESHOLD:
+            return False
 
-        USE_CURRENT_CONTEXT when ANY of these are true:
-        1. The main assistant's last answer contains ANY information about the topic being asked about
-        2. The question asks for more details/examples/explanation of something mentioned in the last answer
-        3. The question uses words like "this", "these", "those" referring to content from the last answer
-        4. The question is about reactions/responses/criticism/support related to what was just discussed
-        5. The question explicitly asks about current context
+        # Ambiguous similarity, let the keywords decide if they can
+        return self._keyword_relevance(keyword_ratio)
 
-        LOAD_NEW_CONTEXT only when ALL of these are true:
-        1. The main assistant's last answer contains NO information about the topic being asked about
-        2. The question asks about documents that aren't currently loaded
-        3. The question requires searching across a broader set of documents
-        4. The question introduces a completely new topic unrelated to the last answer
-        5. The question can't possibly be answered using information from current documents
+    def _keyword_relevance(self, keyword_ratio: float | None) -> bool | None:
+        """Settle an ambiguous relevance check with the keyword ratio, None if it can't."""
+        if keyword_ratio is None:
+            return None
+        if keyword_ratio > self.KEYWORD_RELEVANCE_THRESHOLD:
+            return True
+        if keyword_ratio < self.KEYWORD_AMBIGUOUS_THRESHOLD:
+            return False
+        return None
 
-        EXAMPLES:
+    def _keyword_ratio(self, tokens: list[str]) -> float | None:
+        """Best BM25 score of the loaded documents' summaries over the best score of all summaries.
 
-        Example 1:
-        Previous Question: "What is Bill 118 about?"
-        Previous Answer: "Bill 118 establishes June 1st as Injured Workers Day..."
-        New Question: "Can you explain more about the workplace provisions in this bill?"
-        Current Documents: ["bill 118", "transcript 2023-10-23"]
-        Decision: USE_CURRENT_CONTEXT
-        Reasoning: Follows directly from previous Q&A about Bill 118's contents
+        Returns None if no summary reaches `BM25_THRESHOLD`, i.e. the keywords say nothing.
+        """
+        if not tokens:
+            return None
+        scores = self.bm25.get_scores(tokens)
+        best = scores.max()
+        if best < self.BM25_THRESHOLD:
+            return None
+        rows = [self._summary_rows[k] for k in self.current_document_ids]
+        return float(scores[rows].max() / best)
+
+    def _relevance_context(self) -> str:
+        """Describe the loaded documents and recent conversation for relevance prompts."""
+        conversation_history = "\n".join(self._recent_turns)
+        return f"""
+        Currently loaded COMPLETE documents: {', '.join(self.current_document_ids)}
+        (These are the only documents available for detailed analysis)
 
-        Example 2:
-        Previous Question: "What does Bill 212 say about transportation?"
-        Previous Answer: "Bill 212 includes provisions about bicycle lanes that allow the province to override municipal decisions..."
-        New Question: "I'm concerned about the bicycle lane changes, can you provide more details?"
-        Current Documents: ["bill 212", "transcript 2024-11-21"]
-        Decision: USE_CURRENT_CONTEXT
-        Reasoning: Directly references information provided in last answer about bicycle lanes
+        CONVERSATION FLOW in history (the most recent exchange used these loaded documents):
+        {conversation_history}
+        """
 
-        Example 3:
-        Previous Question: "What did MPPs say about healthcare funding?"
-        Previous Answer: "During the May debates, MPPs discussed hospital funding..."
-        New Question: "What does Bill 124 say about nurses?"
-        Current Documents: ["transcript 2024-05-30"]
-        Decision: LOAD_NEW_CONTEXT
-        Reasoning: Switches from transcript discussions to requesting specific bill content not currently loaded
+    async def _llm_check_context_relevance(self, question: str) -> bool:
+        """Ask the retrieval model if the current context can answer the new question.
 
-        Example 4:
-        Previous Question: "What did the Premier say about healthcare?"
-        Previous Answer: "In the Question Period, Premier Ford highlighted investments including 12,500 licensed physicians and 100% match in residency positions..."
-        New Question: "Can you tell me more about the residency position expansion?"
-        Current Documents: ["transcript 2024-05-08", "transcript 2024-03-20"]
-        Decision: USE_CURRENT_CONTEXT
-        Reasoning: Asks for elaboration on specific detail mentioned in previous answer
+        The check is submitted to `_relevance_gate`, which batches it with any concurrent checks.
+        """
 
-        Example 5:
-        Previous Question: "What were the key points in Bill 75?"
-        Previous Answer: "Bill 75 focuses on housing development regulations..."
-        New Question: "Are there any other bills about housing from this session?"
-        Current Documents: ["bill 75", "transcript 2024-03-15"]
-        Decision: LOAD_NEW_CONTEXT
-        Reasoning: Requires broader search across multiple bills beyond current context
+        decision = await self._relevance_gate.submit(
+            question,
+            self._relevance_context(),
+        )
+        self._print_debug(self.current_document_ids)
+        self._print_debug(f"Checking context relevance decision: {decision}")
+        return decision == "USE_CURRENT_CONTEXT"
 
-        Example 6:
-        Previous Question: "What bills are currently loaded?"
-        Previous Answer: "The currently loaded documents include Bill 124 and several transcripts..."
-        New Question: "What other bills mention healthcare?"
-        Current Documents: ["bill 124", "transcript 2024-05-30"]
-        Decision: LOAD_NEW_CONTEXT
-        Reasoning: Despite being related to current topic, explicitly requests other bills
+    #
+    # FILTERING METHODS
+    #
+    async def _select_relevant_documents(self, question: str) -> list[str]:
+        """Select relevant documents with `_rank_documents`, or the retrieval model if it can't."""
+        relevant_documents = await self._rank_documents(question)
+        if relevant_documents is None:
+            self._print_debug("No close summaries found, asking the retrieval model")
+            return await self._llm_select_relevant_documents(question)
+        return relevant_documents
 
-        Example 7:
-        Previous Question: "Tell me about the housing crisis discussion"
-        Previous Answer: "In these October sessions, MPPs debated housing affordability..."
-        New Question: "What else was said in these sessions?"
-        Current Documents: ["transcript 2023-10-23", "transcript 2023-10-24"]
-        Decision: USE_CURRENT_CONTEXT
-        Reasoning: Explicitly refers to "these sessions" in currently loaded transcripts
+    async def _rank_documents(self, question: str) -> list[str] | None:
+        """Select relevant documents by fusing embedding and keyword search over the summaries.
 
-        Example 8:
-        Previous Question: "What happened in the November 15th session?"
-        Previous Answer: "The November 15th session covered several topics including education funding..."
-        New Question: "Were there any bills introduced that day?"
-        Current Documents: ["transcript 2023-11-15"]
-        Decision: USE_CURRENT_CONTEXT
-        Reasoning: Asks about same session already loaded, just different aspect
+        The nearest summaries (re-ranked with a small recency bias) and the best BM25 matches are
+        combined with reciprocal rank fusion. A ranking is only used if its best score reaches
+        `SELECTION_THRESHOLD` or `BM25_THRESHOLD` respectively. Returns None if neither does.
+        """
+        rankings = [
+            ranked
+            for ranked, confident in await self._search_summaries(question)
+            if confident
+        ]
+        if not rankings:
+            return None
 
-        Example 9:
-        Previous Question: "What did Minister Jones say about healthcare?"
-        Previous Answer: "Minister Jones discussed hospital funding and staffing initiatives..."
-        New Question: "Did any opposition members respond to these points?"
-        Current Documents: ["transcript 2024-05-30", "transcript 2024-05-31"]
-        Decision: USE_CURRENT_CONTEXT
-        Reasoning: Asks about responses to specific points in current transcripts
+        relevant_documents = self._fuse_rankings(rankings, self.MAX_DOCUMENT_CONTEXT)
+        self._print_debug(f"Selected documents: {relevant_documents}")
+        return relevant_documents
 
-        Example 10:
-        Previous Question: "What does the current context contain?"
-        Previous Answer: "Currently loaded documents include Bill 118 and transcript from October 23..."
-        New Question: "Great, can you search other transcripts for mentions of Bill 118?"
-        Current Documents: ["bill 118", "transcript 2023-10-23"]
-        Decision: LOAD_NEW_CONTEXT
-        Reasoning: Explicitly requests search beyond current documents
+    async def _candidate_documents(self, question: str) -> list[str]:
+        """Shortlist the top `RRF_CANDIDATES` documents for the retrieval model to choose from.
 
-        Example 11:
-        Previous Question: "What's in Bill 124?"
-        Previous Answer: "Bill 124 deals with healthcare worker compensation..."
-        New Question: "Show me what's currently loaded"
-        Current Documents: ["bill 124", "transcript 2024-05-30"]
-        Decision: USE_CURRENT_CONTEXT
-        Reasoning: Explicitly asks about current context contents
+        Same fusion as `_rank_documents`, but every ranking is used regardless of its threshold.
+        """
+        rankings = [ranked for ranked, _ in await self._search_summaries(question)]
+        return self._fuse_rankings(rankings, self.RRF_CANDIDATES)
 
-        Example 12:
-        Previous Question: "Did they discuss climate change in October?"
-        Previous Answer: "Yes, in the October 23rd session, MPPs debated environmental policies..."
-        New Question: "What was said about this in other months?"
-        Current Documents: ["transcript 2023-10-23"]
-        Decision: LOAD_NEW_CONTEXT
-        Reasoning: "Other months" explicitly requests searching beyond current transcripts
+    async def _search_summaries(self, question: str) -> list[tuple[np.ndarray, bool]]:
+        """Rank the summaries by embedding similarity and by BM25 score.
 
-        RESPONSE FORMAT:
-        {{
-            "decision": "USE_CURRENT_CONTEXT" or "LOAD_NEW_CONTEXT",
-            "reasoning": "<brief explanation focusing on relationship to previous Q&A exchange>"
-        }}
-        Do NOT include any markdown formatting or backticks in the final answer. Just return a JSON that can be parsed.
+        Returns:
+            For each search, the summary rows of its top `RRF_CANDIDATES` matches, best first,
+            and whether its best score reaches its threshold.
         """
+        query_embedding = await self._embed_query(question)
+        # Dequantize through the query rather than the matrix. NumPy still upcasts the int8
+        # matrix to float for the product, so int8 only saves disk space, not compute
+        similarities = self.summary_embeddings @ (query_embedding / self.summary_scale)
+        keyword_scores = self.bm25.get_scores(build_index.tokenize(question))
+
+        k = min(self.RRF_CANDIDATES, len(similarities))
+
+        top = np.argpartition(-similarities, k - 1)[:k]
+        scores = (1 - self.RECENCY_WEIGHT) * similarities[
+            top
+        ] + self.RECENCY_WEIGHT * self._summary_recency[top]
+        embedding_ranking = (
+            top[np.argsort(-scores)],
+            similarities[top].max() >= self.SELECTION_THRESHOLD,
+        )
 
-        response = self.retrieval_model.generate_content(prompt)
-        response_dct = parse_llm_json(response.text)
-        decision = response_dct["decision"]
-        reasoning = response_dct["reasoning"]
-        self._print_debug(self.current_document_ids)
-        self._print_debug(self._format_usage_stats(response.usage_metadata))
-        self._print_debug(f"Checking context relevance decision: {decision}")
-        self._print_debug(f"Checking context relevance reasoning: {reasoning}")
-        return decision == "USE_CURRENT_CONTEXT"
+        top = np.argpartition(-keyword_scores, k - 1)[:k]
+        ranked = top[np.argsort(-keyword_scores[top])]
+        keyword_ranking = (
+            ranked[keyword_scores[ranked] > 0],
+            keyword_scores[top].max() >= self.BM25_THRESHOLD,
+        )
+        return [embedding_ranking, keyword_ranking]
 
-    #
-    # FILTERING METHODS
-    #
-    def _select_relevant_documents(self, question: str) -> list[str]:
-        """Select relevant transcripts based on question and available summaries."""
+    def _fuse_rankings(self, rankings: list[np.ndarray], n: int) -> list[str]:
+        """Combine rankings of summary rows with reciprocal rank fusion into the `n` best ids."""
+        fused = np.zeros(len(self.summary_ids))
+        for ranked in rankings:
+            fused[ranked] += 1 / (self.RRF_K + 1 + np.arange(len(ranked)))
+        best = np.argsort(-fused, kind="stable")[:n]
+        return [self.summary_ids[i] for i in best if fused[i] > 0]
 
-        prompt = f"""
-        Given the following question about the Ontario Legislature, and using the document summaries provided in your context,
+    def _selection_prompt(self, question: str, candidates: str | None = None) -> str:
+        """Instructions for selecting documents with the retrieval model, without the answer format.
+
+        Args:
+            question (str): The user's question.
+            candidates (str, optional): Summaries to choose from, instead of those in the context.
+        """
+        if candidates:
+            summaries_source = "the candidate document summaries below"
+            candidates = f"CANDIDATE DOCUMENT SUMMARIES:\n{candidates}"
+        else:
+            summaries_source = "the document summaries provided in your context"
+            candidates = ""
+        return f"""
+        Given the following question about the Ontario Legislature, and using {summaries_source},
         select the most relevant documents to help you answer the question.
 
         QUESTION: "{question}"
@@ -599,45 +1224,199 @@ class OLABot:
         Transcripts have ids like "transcript YYYY-MM-DD"
         Bills have ids like "bill 123"
 
-        Return ONLY the document ids, one on each line, without asterisks.
-        Limit your response to {self.MAX_DOCUMENT_CONTEXT} documents maximum.
-        Start with the highest priority document
+        {candidates}
         """
 
-        # get most recent relevant
-        response = self.retrieval_model.generate_content(prompt)
-        response_text = response.text.replace("*", "")  # replace asterisks just in case
+    def _parse_document_ids(self, text: str) -> list[str]:
+        """Pull known document ids out of a retrieval model answer, most recent transcripts if none."""
+        # One sweep over the response, dropping repeats and unknown ids
         relevant_documents = [
-            doc for doc in response_text.split("\n") if doc.strip() in self.documents
+            doc
+            for doc in dict.fromkeys(self._DOC_ID_RE.findall(text))
+            if doc in self._doc_id_set
         ]
 
         # fallback: if none returned
         if not relevant_documents:
             self._print_debug("No specific dates found, using most recent transcripts")
-            relevant_documents = self.available_dates[
-                -(self.MAX_DOCUMENT_CONTEXT + 1) :
+            relevant_documents = [
+                f"transcript {d}"
+                for d in self.available_dates[-self.MAX_DOCUMENT_CONTEXT :]
             ]
 
         # Clip to max context length
-        relevant_documents = relevant_documents[
-            : self.MAX_DOCUMENT_CONTEXT
-        ]  # TODO better clipping
+        return relevant_documents[: self.MAX_DOCUMENT_CONTEXT]  # TODO better clipping
+
+    async def _llm_select_relevant_documents(self, question: str) -> list[str]:
+        """Select relevant documents using the retrieval model and a shortlist of summaries.
+
+        Only the summaries of the `_candidate_documents` are sent, in the prompt of an uncached
+        retrieval model, so the selection prompt does not grow with the corpus.
+        """
+        candidates = documents_to_string(
+            {k: self.summaries[k] for k in await self._candidate_documents(question)},
+        )
+
+        prompt = f"""{self._selection_prompt(question, candidates)}
+        Return ONLY the document ids, one on each line, without asterisks.
+        Limit your response to {self.MAX_DOCUMENT_CONTEXT} documents maximum.
+        Start with the highest priority document
+        """
+
+        # get most recent relevant
+        response = await self.selection_model.generate_content_async(prompt)
+        relevant_documents = self._parse_document_ids(response.text)
+
+        self._print_debug(
+            self._format_usage_stats(
+                response.usage_metadata,
+                "_llm_select_relevant_documents",
+            ),
+        )
+        self._print_debug(f"Selected documents: {relevant_documents}")
+        return relevant_documents
+
+    #
+    # ROUTING METHODS
+    #
+    async def _route(self, question: str) -> list[str] | None:
+        """Decide whether to keep the current context, and which documents to load if not.
+
+        Both decisions are tried locally first, so a turn makes at most one retrieval model
+        call. When neither can be made locally, they are asked for together in one prompt
+        (`_llm_route`).
+
+        Questions that name bills or dates (`_referenced_documents`) are routed without a
+        retrieval model call (`_route_referenced`).
+
+        Returns:
+            None to keep the current context, otherwise the ids of the documents to load.
+        """
+        # An explicit request to look elsewhere ("forget that", "search all transcripts")
+        # always loads new context, even when the question names loaded documents
+        look_elsewhere = bool(self._NEW_CONTEXT_RE.search(question))
+        if look_elsewhere:
+            self._print_debug("Question asks to look elsewhere")
+
+        referenced = self._referenced_documents(question)
+        if referenced:
+            return await self._route_referenced(question, referenced, look_elsewhere)
+
+        use_current = (
+            False if look_elsewhere else await self._local_context_relevance(question)
+        )
+        if use_current:
+            return None
+
+        relevant_documents = await self._rank_documents(question)
+        if use_current is None:
+            if relevant_documents is None:
+                return await self._llm_route(question)
+            if await self._llm_check_context_relevance(question):
+                return None
+        elif relevant_documents is None:
+            self._print_debug("No close summaries found, asking the retrieval model")
+            return await self._llm_select_relevant_documents(question)
+
+        return relevant_documents
+
+    async def _route_referenced(
+        self,
+        question: str,
+        referenced: list[str],
+        look_elsewhere: bool,
+    ) -> list[str] | None:
+        """Route a question that names bills or dates.
+
+        The current context is kept if it holds every named document and the question does not
+        ask to look elsewhere ("search all transcripts for Bill 118"). Otherwise the named
+        documents are loaded first, and the remaining slots are filled with the best
+        `_rank_documents` matches, e.g. the debates about a named bill.
+        """
+        self._print_debug(f"Question references documents: {referenced}")
+        if not look_elsewhere and set(referenced) <= set(self.current_document_ids):
+            return None
+        ranked = await self._rank_documents(question) or []
+        return list(dict.fromkeys(referenced + ranked))[: self.MAX_DOCUMENT_CONTEXT]
+
+    def _referenced_documents(self, question: str) -> list[str]:
+        """Ids of the bills and transcripts named in a question.
+
+        Returns an empty list if nothing is named, or if any named bill or date does not exist.
+        """
+        referenced = []
+        for bill, date in self._QUESTION_REF_RE.findall(question):
+            doc = f"bill {bill}" if bill else f"transcript {date}"
+            if doc not in self._doc_id_set:
+                return []
+            referenced.append(doc)
+        return list(dict.fromkeys(referenced))
+
+    async def _llm_route(self, question: str) -> list[str] | None:
+        """Ask the retrieval model for the relevance decision and the documents in one call."""
+
+        prompt = f"""
+        Answer two things about the question below in one response.
+
+        1. CONTEXT RELEVANCE CHECK: follow the CONTEXT RELEVANCE CHECK INSTRUCTIONS in your
+        context for this single question, except for their response format.
 
-        self._print_debug(self._format_usage_stats(response.usage_metadata))
+        QUESTION 1: "{question}"
+        {self._relevance_context()}
+
+        2. DOCUMENT SELECTION: if the decision is LOAD_NEW_CONTEXT, select the documents to load.
+        {self._selection_prompt(question)}
+
+        RESPONSE FORMAT:
+        {{
+            "decision": "USE_CURRENT_CONTEXT" or "LOAD_NEW_CONTEXT",
+            "documents": [<up to {self.MAX_DOCUMENT_CONTEXT} document ids, highest priority first, empty if USE_CURRENT_CONTEXT>]
+        }}
+        Do NOT include any markdown formatting or backticks in the final answer. Just return a JSON that can be parsed.
+        """
+
+        response = await self._get_retrieval_model().generate_content_async(prompt)
+        self._print_debug(self._format_usage_stats(response.usage_metadata, "_llm_route"))
+        try:
+            response_dct = parse_llm_json(response.text)
+            decision = response_dct["decision"]
+            documents = response_dct.get("documents") or []
+        except (ValueError, KeyError, TypeError):
+            # Unparseable, keep the current context unless the raw answer names documents
+            named = any(
+                doc in self._doc_id_set
+                for doc in self._DOC_ID_RE.findall(response.text)
+            )
+            decision = (
+                "LOAD_NEW_CONTEXT"
+                if named and "USE_CURRENT_CONTEXT" not in response.text
+                else "USE_CURRENT_CONTEXT"
+            )
+            documents = [response.text]
+        self._print_debug(f"Routing decision: {decision}")
+
+        if decision == "USE_CURRENT_CONTEXT":
+            return None
+        if isinstance(documents, str):  # a single id, not in a list
+            documents = [documents]
+        relevant_documents = self._parse_document_ids("\n".join(map(str, documents)))
         self._print_debug(f"Selected documents: {relevant_documents}")
         return relevant_documents
 
     #
     # RESPONSE GENERATION METHODS
     #
-    def _generate_response(self, question: str) -> str | Generator:
+    async def _generate_response(self, question: str) -> str | AsyncGenerator:
         """Generate response using selected transcripts.
 
-        Returns a string if not streaming, otherwise a generator.
+        Returns a string if not streaming, otherwise an async iterable of chunks.
         """
 
         try:
-            response = self.chat_session.send_message(question, stream=self.streaming)
+            response = await self.chat_session.send_message_async(
+                question,
+                stream=self.streaming,
+            )
             self._print_debug("Generated response")  # Add debug logging
 
             if not self.streaming:
@@ -650,41 +1429,71 @@ class OLABot:
             self._print_debug(f"Error generating response: {str(e)}")
             raise
 
-    def chat_interface(self, question: str) -> Generator:
-        """Main chat interface."""
+    async def _remember_turn(self, question: str, answer: str) -> None:
+        """Record an answered turn for later relevance checks."""
+        self._recent_turn_embeddings.append(await self._embed_query(question))
+        self._recent_turns.append(f"Previous user: {question}")
+        self._recent_turns.append(
+            f"Previous model: {answer[: self.ANSWER_HEAD_CHARS]}",
+        )
+        self._last_answer_tokens = set(
+            build_index.tokenize(answer[: self.ANSWER_HEAD_CHARS]),
+        )
+
+    async def chat_interface_async(self, question: str) -> AsyncGenerator:
+        """Main chat interface.
+
+        The relevance check and document selection are made together by `_route`, with at most
+        one retrieval model call per turn.
+        """
         try:
+            relevant_documents = await self._route(question)
+
             # Check if current context is relevant
-            if self._check_context_relevance(question):
+            if relevant_documents is None:
                 self._print_debug("Using cached context")
-                response = self._generate_response(question)
+                response = await self._generate_response(question)
             # Load new context
             else:
                 self._print_debug("Fetching new context")
-                relevant_documents = self._select_relevant_documents(question)
                 self._update_current_context(relevant_documents)
 
                 if not relevant_documents:
-                    return "I couldn't find any relevant discussions in the available transcripts."
+                    yield "I couldn't find any relevant discussions in the available transcripts."
+                    return
 
-                response = self._generate_response(question)
+                response = await self._generate_response(question)
 
             if not self.streaming:
+                await self._remember_turn(question, response)
                 yield response
-
-            # handle streaming
-            full_response = ""
-            for chunk in response:
-                full_response += chunk.text
+                return
+
+            # handle streaming, keeping only the start of the answer
+            answer_head = ""
+            last_chunk = None
+            async for chunk in response:
+                if len(answer_head) < self.ANSWER_HEAD_CHARS:
+                    answer_head += chunk.text
+                last_chunk = chunk
                 yield chunk.text
 
-            self._print_debug(self._format_usage_stats(chunk.usage_metadata))
+            # Usage stats come with the last chunk, an empty stream has none
+            if last_chunk is not None:
+                self._print_debug(
+                    self._format_usage_stats(
+                        last_chunk.usage_metadata,
+                        "chat_interface",
+                    ),
+                )
+            await self._remember_turn(question, answer_head)
 
         # catchall error handling for the whole chatbot
         # so try to print as much detail as possible
         except Exception as e:
             exc_type, exc_value, exc_traceback = sys.exc_info()
             self._print_debug(
-                "".join(traceback.format_exception_only(exc_type, exc_value)).strip()
+                "".join(traceback.format_exception_only(exc_type, exc_value)).strip(),
             )
             self._print_debug("".join(traceback.format_tb(exc_traceback)))
 
@@ -693,16 +1502,42 @@ class OLABot:
             )
             yield error_msg
 
+    def chat_interface(self, question: str) -> Generator:
+        """Synchronous wrapper around `chat_interface_async` for the CLI."""
+        response = self.chat_interface_async(question)
+        while True:
+            try:
+                yield self._loop.run_until_complete(anext(response))
+            except StopAsyncIteration:
+                return
+
+    #
+    # CLEANUP METHODS
+    #
+    def close(self) -> None:
+        """Delete the context caches this bot created and close its event loop."""
+        try:
+            delete_caches(
+                [cached_content for _, cached_content in self.context_caches.values()],
+            )
+            self._print_debug("Deleted context caches")
+        # Whatever went wrong, the loop is still closed and the bot can quit
+        except Exception as e:  # noqa: BLE001
+            self._print_debug(f"Error cleaning up caches: {e}")
+        self._loop.close()
+
 
 def main():
     # Parse CLI arguments
     parser = argparse.ArgumentParser(description="CLI with debug and streaming options")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     parser.add_argument("--no-streaming", action="store_true", help="Disable streaming mode")
+    parser.add_argument("--purge-caches", action="store_true", help="Delete all caches in the cloud before starting")
     args = parser.parse_args()
 
-    # Clear all caches in the cloud
-    delete_all_caches()
+    # Clear caches left over by previous runs
+    if args.purge_caches:
+        delete_all_caches()
 
     # Initialize bot
     bot = OLABot("./documents.json", "./summaries.json", debug = args.debug, streaming = not args.no_streaming)
@@ -724,12 +1559,7 @@ def main():
     except KeyboardInterrupt:
         bot._print_debug("Interrupted by user.")
     finally:
-        try:
-            bot.current_context_cache.delete()
-            bot.summaries_cache.delete()
-            bot._print_debug("Deleted all caches")
-        except Exception as e:
-            bot._print_debug(f"Error cleaning up caches: {e}")
+        bot.close()
 
         print(f"\n{Fore.CYAN}Goodbye! 👋{Style.RESET_ALL}\n")
 
@@ -1,17 +1,80 @@
-import copy
+import concurrent.futures
 import json
 import re
-from urllib.parse import urljoin
+from http import HTTPStatus
+from pathlib import Path
 
+import lxml.html
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Base URL for the Hansard documents page
 BILL_BASE_URL = (
     "https://www.ola.org/en/legislative-business/bills/parliament-43/session-1/"
 )
 HANS_BASE_URL = "https://www.ola.org/en/legislative-business/house-documents/parliament-43/session-1/"
-DATE_PATTERN = r"(\d{4}-\d{2}-\d{2})"
+# libxml2-backed parser, much faster than the pure-Python "html.parser"
+# libxml2 turns each "\r\n" into "\n", so pages go through `_keep_carriage_returns` first
+HTML_PARSER = "lxml"
+# Text nodes of the transcript div, leaving out scripts and styles like bs4's get_text
+TRANSCRIPT_TEXT_XPATH = "descendant::text()[not(ancestor::script or ancestor::style)]"
+ASCII_SPACES = " \n\t\f\r"
+BILL_NUMBER_CLASS = "views-field views-field-field-bill-number"
+BILL_TITLE_CLASS = "views-field views-field-field-short-title"
+MAX_WORKERS = 16
+REQUEST_TIMEOUT = 30  # seconds
+
+# One pooled session for every request, so connections to ola.org are reused
+# Transient server errors are retried with backoff, missing pages (404) are not
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False,  # hand back the last response, like a plain get
+        ),
+    ),
+)
+
+DATE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})")
+# Escaped hex characters left over in scraped text, like "\\xa0"
+HEX_ESCAPE_PATTERN = re.compile(r"\\x[0-9A-Fa-f]{2}")
+# Whitespace cleanup of transcripts, applied in this order
+DOUBLE_NEWLINE_PATTERN = re.compile(r"\n\n")
+NEWLINE_RUN_PATTERN = re.compile(r"\n{4,}")
+COLON_NEWLINE_PATTERN = re.compile(r":\n")
+BILL_STATUS_CLASS_PATTERN = re.compile("views-field-field-current-status*")
+EXPLANATORY_NOTE_PATTERN = re.compile("EXPLANATORY NOTE", re.IGNORECASE)
+# Bills have a simple pattern: "Bill 123A", on a single line
+BILL_PATTERN = re.compile(r"Bill[^\S\n]+\d+[A-Za-z]*")
+# Lines like "Hon. Doug Ford:" or "The Speaker (Hon. Ted Arnott):", up to the first colon
+# Anchored on the newline itself, which the regex engine can search for much faster than
+# a multiline "^"
+SPEAKER_PATTERN = re.compile(r"\n[^\S\n]*((?:Mr\.|Ms\.|Mrs\.|Hon\.|The)[^:\n]*):")
+SPEAKER_TITLES = ("Mr.", "Ms.", "Mrs.", "Hon.")
+# Carriage returns in text, not inside a tag: the next angle bracket is an opening one
+TEXT_CARRIAGE_RETURN_PATTERN = re.compile(r"\r(?=[^<>]*<)")
+# Header lines of a transcript's table of contents, which are not topics
+HEADER_MARKERS = ("LEGISLATIVE ASSEMBLY", "ASSEMBLÉE LÉGISLATIVE")
+DAY_PREFIXES = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Lundi",
+    "Mardi",
+    "Mercredi",
+    "Jeudi",
+    "Vendredi",
+)
 
 
 #
@@ -19,19 +82,32 @@ DATE_PATTERN = r"(\d{4}-\d{2}-\d{2})"
 #
 def get_bill_names() -> list[tuple]:
     """Returns bill id numbers and titles for all bills in current legislature."""
-    response = requests.get(BILL_BASE_URL)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = SESSION.get(BILL_BASE_URL, timeout=REQUEST_TIMEOUT)
+    tree = lxml.html.fromstring(response.content)
 
-    elements = soup.find_all("td", class_="views-field views-field-field-bill-number")
-    bills = [f"{x.get_text(strip=True)}" for x in elements]  # pr bills are useless
+    # One pass over the table rows, reading both cells of each row
+    output = []
+    for row in tree.xpath(f"//tr[td[@class='{BILL_NUMBER_CLASS}']]"):
+        bill = _cell_text(row, BILL_NUMBER_CLASS)
+        if "pr" in bill.lower():
+            continue  # pr bills are useless
+        output.append((bill, _cell_text(row, BILL_TITLE_CLASS)))
 
-    elements = soup.find_all("td", class_="views-field views-field-field-short-title")
-    titles = [f"{x.get_text(strip=True)}" for x in elements]
+    return output
 
-    output = zip(bills, titles, strict=True)
-    output = [(x[0], x[1]) for x in output if "pr" not in x[0].lower()]
 
-    return output
+def _keep_carriage_returns(html: str) -> str:
+    """Escapes carriage returns in the text of a page, so lxml keeps them.
+
+    Pages use CRLF line endings, which html.parser kept and libxml2 would turn into plain
+    newlines. A character reference is left alone, so the parsed text matches html.parser's.
+    """
+    return TEXT_CARRIAGE_RETURN_PATTERN.sub("&#13;", html)
+
+
+def _cell_text(row: lxml.html.HtmlElement, class_name: str) -> str:
+    """Returns the stripped text of a row's cell, like bs4's `get_text(strip=True)`."""
+    return "".join(t.strip() for t in row.xpath(f"td[@class='{class_name}']//text()"))
 
 
 def fetch_bill_contents(bill: str) -> str:
@@ -45,11 +121,11 @@ def fetch_bill_contents(bill: str) -> str:
 
     url = BILL_BASE_URL + "bill-" + bill_id
 
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+    soup = BeautifulSoup(_keep_carriage_returns(response.text), HTML_PARSER)
 
     status = (
-        soup.find("p", class_=re.compile("views-field-field-current-status*"))
+        soup.find("p", class_=BILL_STATUS_CLASS_PATTERN)
         .get_text(strip=True)
         .replace("\n", "")
         .replace("\t", "")
@@ -72,7 +148,7 @@ def fetch_bill_contents(bill: str) -> str:
 
         # Get rid of any special hex characters
         text = text.replace("\xa0", " ")
-        text = re.sub(r"\\x[0-9A-Fa-f]{2}", "", text)
+        text = HEX_ESCAPE_PATTERN.sub("", text)
 
         return (sponsor, status, text)
     except AttributeError as e:
@@ -85,19 +161,19 @@ def fetch_bill_contents(bill: str) -> str:
 #
 def get_hansard_dates() -> list[str]:
     """Returns a list of yyyy-mm-dd date strings."""
-    response = requests.get(HANS_BASE_URL)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = SESSION.get(HANS_BASE_URL, timeout=REQUEST_TIMEOUT)
+    tree = lxml.html.fromstring(response.text)
     dates = {
-        re.search(DATE_PATTERN, urljoin(HANS_BASE_URL, link["href"])).group(0)
-        for link in soup.find_all("a", href=True)
-        if re.search(DATE_PATTERN, link["href"])
+        match.group(0)
+        for href in tree.xpath("//a/@href")
+        if (match := DATE_PATTERN.search(href))
     }
     return list(dates)
 
 
 def fetch_hansard_content(date: str) -> str:
     # Links are like hansard, then hansard-1, hansard-2...
-    combined_content = ""
+    pages = []
     page_num = (
         0  # Using a separate variable to avoid overwriting the outer loop's index
     )
@@ -106,29 +182,45 @@ def fetch_hansard_content(date: str) -> str:
         suffix = f"-{page_num}" if page_num > 0 else ""
         url = f"{HANS_BASE_URL}{date}/hansard{suffix}"
 
-        response = requests.get(url)
-        if response.status_code != 200:
+        response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+        if response.status_code == HTTPStatus.NOT_FOUND:
             break  # Stop if the page doesn't exist
+        # Any other failure survived the retries, don't save a truncated transcript
+        response.raise_for_status()
 
         # Parse and extract main content
-        soup = BeautifulSoup(response.text, "html.parser")
-        main_content = soup.find("div", {"id": "transcript"})
+        tree = lxml.html.fromstring(_keep_carriage_returns(response.text))
+        main_content = tree.find(".//div[@id='transcript']")
 
-        if main_content:
-            combined_content += main_content.get_text(separator="\n")
+        if main_content is not None:
+            pages.append(_transcript_text(main_content))
         else:
             print(f"Warning: Content not found on {url}")
 
         page_num += 1  # Move to the next page with suffix
 
-    combined_content = re.sub(r"\\x[0-9a-fA-F]{2}", "", combined_content)
-    combined_content = re.sub(r"\n\n", "\n", combined_content)
-    combined_content = re.sub(r"\n{4,}", "\n\n\n", combined_content)
-    combined_content = re.sub(r":\n", ":", combined_content)
+    combined_content = HEX_ESCAPE_PATTERN.sub("", "".join(pages))
+    combined_content = DOUBLE_NEWLINE_PATTERN.sub("\n", combined_content)
+    combined_content = NEWLINE_RUN_PATTERN.sub("\n\n\n", combined_content)
+    combined_content = COLON_NEWLINE_PATTERN.sub(":", combined_content)
 
     return combined_content
 
 
+def _transcript_text(div: lxml.html.HtmlElement) -> str:
+    """Returns the text of a transcript div, like bs4's `get_text` with a newline separator.
+
+    Like bs4, strings of only ASCII whitespace are collapsed to a newline or a space.
+    """
+    strings = []
+    for text in div.xpath(TRANSCRIPT_TEXT_XPATH):
+        if text and not text.strip(ASCII_SPACES):
+            strings.append("\n" if "\n" in text else " ")
+        else:
+            strings.append(text)
+    return "\n".join(strings)
+
+
 #
 # DOCUMENT SUMMARIZING
 #
@@ -136,23 +228,14 @@ def generate_transcript_summary(date: str, text: str) -> str:
     """Process and store topics and speakers for each transcript."""
 
     # Find Topics, skipping header lines and empty lines
-    toc_lines = text.split("\n\n")[0:50]
+    # Only the first 50 blocks are split off, the rest of the transcript is left alone
+    toc_lines = text.split("\n\n", 50)[0:50]
     topics = [
         line.strip()
         for line in toc_lines
         if line.strip()
-        and "LEGISLATIVE ASSEMBLY" not in line
-        and "ASSEMBLÉE LÉGISLATIVE" not in line
-        and not line.startswith("Thursday")
-        and not line.startswith("Monday")
-        and not line.startswith("Tuesday")
-        and not line.startswith("Wednesday")
-        and not line.startswith("Friday")
-        and not line.startswith("Jeudi")
-        and not line.startswith("Lundi")
-        and not line.startswith("Mardi")
-        and not line.startswith("Mercredi")
-        and not line.startswith("Vendredi")
+        and not any(marker in line for marker in HEADER_MARKERS)
+        and not line.startswith(DAY_PREFIXES)
     ]
 
     # Find speakers in Question Period and other sections
@@ -164,35 +247,18 @@ def generate_transcript_summary(date: str, text: str) -> str:
     Example of failure mode (has colon and starts with The):
     The 911 model of care that we referenced at the Association of Municipalities of Ontario conference earlier this week has been embraced: community paramedicine that allows community paramedics to go into those homes, for individuals who are able, in most cases with very little support, to stay safely in their home. The municipalities that have embraced that 911 model of care have loved it. In fact, our satisfaction rate, I believe, is in the 97th percentile.
     """
+    # Speakers and bills are each found in one regex sweep over the whole transcript
     speakers = set()
-    lines = text.split("\n")
-    for line in lines:
-        # Process lines that start with a title prefix
-        if (
-            any(
-                line.strip().startswith(prefix)
-                for prefix in ["Mr.", "Ms.", "Mrs.", "Hon.", "The"]
-            )
-            and ":" in line
+    for match in SPEAKER_PATTERN.findall("\n" + text):
+        # Keep names with a riding in parentheses or a title
+        speaker = match.strip()
+        if ("(" in speaker and ")" in speaker) or any(
+            title in speaker for title in SPEAKER_TITLES
         ):
-            speaker = line.split(":")[0].strip()
-            if ("(" in speaker and ")" in speaker) or any(
-                title in speaker for title in ["Mr.", "Ms.", "Mrs.", "Hon."]
-            ):
-                speakers.add(speaker)
+            speakers.add(speaker)
 
     speakers = list(speakers)
-
-    # Find bills
-    # Bills have a simple pattern: "Bill 123A"
-    bills = set()
-    bill_pattern = re.compile(r"Bill\s+\d+[A-Za-z]*")
-
-    for line in lines:
-        bill_matches = bill_pattern.findall(line)
-        bills.update(bill_matches)
-
-    bills = list(bills)
+    bills = list(set(BILL_PATTERN.findall(text)))
 
     transcript_summary = f"Transcript from: {date} | Speakers: {', '.join(speakers)} | Topics: {', '.join(topics)} | Bills: {', '.join(bills) if bills else 'None'}"
 
@@ -206,36 +272,27 @@ def generate_bill_summary(bill_num: str, contents: str) -> str:
     result = match.group(1) if match else contents[0:1000]
 
     result = result.replace("\n", " ").replace(".", ". ").replace("  ", " ")
-    result = re.sub(
-        "EXPLANATORY NOTE",
-        "",
-        result,
-        flags=re.IGNORECASE,
-        count=1,
-    )
+    result = EXPLANATORY_NOTE_PATTERN.sub("", result, count=1)
 
     result = result.strip()
     return result
 
 
 def summarize(docs: dict) -> None:
-    summaries = copy.deepcopy(docs)
-    for k, v in summaries.items():
-        if "transcript" in k:
-            v["summary"] = generate_transcript_summary(
-                v["id_number"],
-                v.pop("contents"),
-            )
-        elif "bill" in k:
-            v["summary"] = generate_bill_summary(
-                v["id_number"],
-                v.pop("contents"),
-            )
+    summaries = {}
+    for k, doc in docs.items():
+        # Shallow copy without the contents, which can be megabytes per transcript
+        v = {kk: vv for kk, vv in doc.items() if kk != "contents"}
+        if doc["type"] == "transcript":
+            v["summary"] = generate_transcript_summary(v["id_number"], doc["contents"])
+        elif doc["type"] == "bill":
+            v["summary"] = generate_bill_summary(v["id_number"], doc["contents"])
+        summaries[k] = v
 
     return summaries
 
 
-def scrape() -> None:
+def scrape(previous: dict | None = None) -> None:
     """Scrapes bill and hansard (transcript) data from Ontario Legislature.
 
     Creates a documents.json with the following structure:
@@ -250,11 +307,18 @@ def scrape() -> None:
         ```
 
     In this case, `document_id` is "Bill [bill number]" for bills, and "yyyy-mm-dd Transcript" for transcripts
+
+    Args:
+        previous (dict, optional): documents from an earlier scrape. Transcripts of past sitting
+            days do not change, so those found here are reused instead of fetched again. The most
+            recent one is still refetched, in case it was scraped before it was complete. Bills
+            are always refetched, since their status changes.
     """
     bills = get_bill_names()
     bill_data = {}
-    for b in bills:
-        sponsor, status, contents = fetch_bill_contents(b)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        bill_contents = list(ex.map(fetch_bill_contents, bills))
+    for b, (sponsor, status, contents) in zip(bills, bill_contents, strict=True):
         v = {
             "type": "bill",
             "id_number": b[0],
@@ -266,12 +330,23 @@ def scrape() -> None:
 
         bill_data[f"bill {b[0]}"] = v
 
+    cached = {
+        v["id_number"]: v["contents"]
+        for v in (previous or {}).values()
+        if v["type"] == "transcript" and v["contents"]
+    }
+    latest_cached = max(cached, default="")
     dates = get_hansard_dates()
+    new_dates = [d for d in dates if d not in cached or d >= latest_cached]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        hans_contents = dict(
+            zip(new_dates, ex.map(fetch_hansard_content, new_dates), strict=True),
+        )
     hans_data = {
         f"transcript {d}": {
             "type": "transcript",
             "id_number": d,
-            "contents": fetch_hansard_content(d),
+            "contents": hans_contents[d] if d in hans_contents else cached[d],
         }
         for d in dates
     }
@@ -282,12 +357,18 @@ def scrape() -> None:
 
 
 if __name__ == "__main__":
-    documents = scrape()
+    try:
+        with Path("documents.json").open(encoding="utf-8") as f:
+            previous = json.load(f)
+    except FileNotFoundError:
+        previous = None
+
+    documents = scrape(previous)
 
-    with open("documents.json", "w") as f:
+    with Path("documents.json").open("w", encoding="utf-8") as f:
         json.dump(documents, f)
 
     summaries = summarize(documents)
 
-    with open("summaries.json", "w") as f:
+    with Path("summaries.json").open("w", encoding="utf-8") as f:
         json.dump(summaries, f)